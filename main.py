@@ -12,6 +12,7 @@ Fonctionnalités :
 - Interface utilisateur simple et intuitive
 """
 
+import argparse
 import sys
 import os
 import tkinter as tk
@@ -44,6 +45,11 @@ def check_dependencies():
     except ImportError:
         missing_deps.append("folium")
     
+    try:
+        import pandas
+    except ImportError:
+        missing_deps.append("pandas")
+    
     if missing_deps:
         error_msg = f"""
 ❌ Dépendances manquantes : {', '.join(missing_deps)}
@@ -52,7 +58,7 @@ Pour installer les dépendances manquantes, exécutez :
 pip install -r requirements.txt
 
 Ou installez manuellement :
-pip install folium
+pip install folium pandas
         """
         print(error_msg)
         return False
@@ -82,10 +88,46 @@ dans le dossier 'data' de l'application.
     return True
 
 
-def main():
+def parse_arguments(argv=None) -> argparse.Namespace:
+    """
+    Analyse les arguments de la ligne de commande en une seule passe.
+    
+    L'aide détaillée est gérée par show_help() : l'aide automatique
+    d'argparse est désactivée. Le mot-clé "help" est accepté à la place
+    du fichier, et les options inconnues sont ignorées comme auparavant.
+    
+    Args:
+        argv (list): Arguments à analyser (par défaut sys.argv[1:])
+        
+    Returns:
+        argparse.Namespace: Attributs "file" (fichier de PR ou None) et "help"
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('file', nargs='?')
+    parser.add_argument('-h', '--help', action='store_true', dest='help')
+    args, _ = parser.parse_known_args(argv)
+    
+    if args.file == 'help':
+        args.help = True
+        args.file = None
+    
+    # Seuls les fichiers .txt et .csv sont pris en compte
+    if args.file is not None and not args.file.endswith(('.txt', '.csv')):
+        args.file = None
+    
+    return args
+
+
+def main(args: argparse.Namespace = None):
     """
     Point d'entrée principal de l'application JBW Viewer.
+    
+    Args:
+        args (argparse.Namespace): Arguments analysés par parse_arguments()
     """
+    if args is None:
+        args = parse_arguments()
+    
     print("Demarrage de JBW Viewer...")
     print("=" * 50)
     
@@ -107,8 +149,8 @@ def main():
         app = JBWViewerUI()
         
         # Vérifier si un fichier de PR a été fourni en argument
-        if len(sys.argv) > 1 and sys.argv[1].endswith(('.txt', '.csv')):
-            pr_file = sys.argv[1]
+        if args.file:
+            pr_file = args.file
             if os.path.exists(pr_file):
                 print(f"Chargement du fichier de PR : {pr_file}")
                 app.load_pr_from_file_path(pr_file)
@@ -264,9 +306,9 @@ GESTION D'ERREURS:
 
 DEPENDANCES REQUISES:
 
-    Python 3.7+ avec modules:
-    - folium>=0.14.0 : Cartographie interactive
-    - pyproj>=3.0.0 : Conversion de coordonnees
+    Python 3.8+ avec modules:
+    - folium>=0.19.0 : Cartographie interactive
+    - pandas>=1.5.0 : Lecture rapide du fichier CSV
     - tkinter : Interface graphique (inclus)
 
     Installation:
@@ -291,11 +333,12 @@ JBW Viewer - Visualisation simple et efficace de Points de Reference
 
 
 if __name__ == "__main__":
-    # Vérifier les arguments de ligne de commande
-    if len(sys.argv) > 1 and sys.argv[1] in ['-h', '--help', 'help']:
+    # Analyser les arguments de ligne de commande
+    args = parse_arguments()
+    if args.help:
         show_help()
         sys.exit(0)
     
     # Lancer l'application
-    exit_code = main()
+    exit_code = main(args)
     sys.exit(exit_code)
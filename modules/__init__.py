@@ -6,6 +6,7 @@ Ce package contient tous les modules de l'application JBW Viewer.
 
 Modules disponibles :
 - data_manager : Gestion des données CSV
+- projection : Conversion des coordonnées Lambert 93 -> WGS84
 - map_generator : Génération des cartes Leaflet
 - ui_components : Interface utilisateur Tkinter
 
@@ -10,9 +10,185 @@ Date: 2025
 Version: 1.0
 """
 
-import csv
+import io
+import multiprocessing
 import os
-from typing import List, Dict, Tuple
+from collections import defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .projection import lambert93_to_wgs84
+
+
+# Colonnes lues dans le fichier CSV des PR
+CSV_COLUMNS = ['codeCI', 'codeCH', 'libelleCI', 'XLambert93', 'YLambert93']
+
+# Colonnes texte à nettoyer après lecture (espaces et tabulations)
+TEXT_COLUMNS = ['codeCI', 'codeCH', 'libelleCI']
+
+# Type de chaque colonne, imposé dès la lecture (aucune détection automatique)
+CSV_DTYPES = {
+    'codeCI': str,
+    'codeCH': str,
+    'libelleCI': str,
+    'XLambert93': np.float64,
+    'YLambert93': np.float64
+}
+
+# Nombre de lignes lues par bloc dans le fichier CSV
+CSV_CHUNK_SIZE = 4096
+
+# Extension du cache (format Feather) écrit à côté du fichier CSV
+CACHE_EXTENSION = '.feather'
+
+# Taille (en octets) à partir de laquelle le CSV est découpé et lu en
+# parallèle : en dessous, le coût de lancement des processus l'emporte
+PARALLEL_LOAD_THRESHOLD = 64 * 1024 * 1024
+
+# Options de lecture communes à la lecture simple et à la lecture parallèle
+CSV_READ_OPTIONS = {
+    'usecols': CSV_COLUMNS,
+    'dtype': CSV_DTYPES,
+    'decimal': ',',
+    'quotechar': '"',
+    'encoding': 'utf-8',
+    # Pas de détection des valeurs manquantes : des codes CH valent réellement
+    # "NA" et certains libellés sont vides, ils doivent rester des chaînes
+    'na_filter': False
+}
+
+# Colonnes calculées au chargement : coordonnées converties en WGS84
+WGS84_COLUMNS = ['latWGS84', 'lonWGS84']
+
+# Un Point de Référence, reconstruit à la demande à partir des colonnes
+PR = namedtuple('PR', CSV_COLUMNS + WGS84_COLUMNS)
+
+
+def _empty_dataframe() -> pd.DataFrame:
+    """
+    Crée un tableau de PR vide (utilisé en cas d'erreur de chargement).
+    
+    Returns:
+        pd.DataFrame: Tableau vide avec toutes les colonnes attendues
+    """
+    return pd.DataFrame(columns=CSV_COLUMNS + WGS84_COLUMNS)
+
+
+
+def _clean_text_columns(df: pd.DataFrame) -> None:
+    """
+    Nettoie les colonnes texte d'un bloc de données (en place).
+    
+    Supprime les espaces et tabulations qui entourent chaque valeur ; les
+    guillemets sont déjà retirés par le lecteur CSV.
+    
+    Args:
+        df (pd.DataFrame): Bloc de données lu dans le CSV
+    """
+    for column in TEXT_COLUMNS:
+        df[column] = df[column].str.strip()
+
+
+def _add_wgs84_columns(df: pd.DataFrame) -> None:
+    """
+    Ajoute les colonnes latWGS84 et lonWGS84 à un bloc de données (en place).
+    
+    Args:
+        df (pd.DataFrame): Bloc de données avec XLambert93 et YLambert93
+    """
+    df['latWGS84'], df['lonWGS84'] = lambert93_to_wgs84(
+        df['XLambert93'].to_numpy(), df['YLambert93'].to_numpy()
+    )
+
+
+def _split_csv_ranges(csv_file_path: str, parts: int) -> List[Tuple[int, int]]:
+    """
+    Découpe le fichier CSV en plages d'octets alignées sur les fins de ligne.
+    
+    Chaque borne est avancée jusqu'au début de la ligne suivante, pour
+    qu'aucune ligne ne soit coupée en deux (le fichier ne contient pas de
+    retour à la ligne à l'intérieur d'une valeur).
+    
+    Args:
+        csv_file_path (str): Chemin du fichier CSV
+        parts (int): Nombre de plages souhaité
+        
+    Returns:
+        List[Tuple[int, int]]: Plages (début, fin) en octets, en-tête exclu
+    """
+    size = os.path.getsize(csv_file_path)
+    
+    with open(csv_file_path, 'rb') as file:
+        header_end = len(file.readline())
+        bounds = [header_end]
+        for i in range(1, parts):
+            file.seek(max(header_end, i * size // parts))
+            file.readline()
+            bounds.append(file.tell())
+        bounds.append(size)
+    
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def _parse_csv_range(csv_file_path: str, names: List[str], start: int, end: int) -> pd.DataFrame:
+    """
+    Lit, nettoie et convertit en WGS84 une plage d'octets du fichier CSV.
+    
+    Exécutée dans un processus séparé par _read_csv_parallel.
+    
+    Args:
+        csv_file_path (str): Chemin du fichier CSV
+        names (List[str]): Noms des colonnes (lus dans l'en-tête)
+        start (int): Position de début de la plage (en octets)
+        end (int): Position de fin de la plage (en octets)
+        
+    Returns:
+        pd.DataFrame: Données nettoyées de la plage, avec les colonnes WGS84
+    """
+    with open(csv_file_path, 'rb') as file:
+        file.seek(start)
+        raw = file.read(end - start)
+    
+    df = pd.read_csv(io.BytesIO(raw), header=None, names=names, **CSV_READ_OPTIONS)
+    _clean_text_columns(df)
+    _add_wgs84_columns(df)
+    return df
+
+
+def _read_csv_parallel(csv_file_path: str) -> pd.DataFrame:
+    """
+    Lit un gros fichier CSV en parallèle, une plage d'octets par processus.
+    
+    Chaque processus lit, nettoie et convertit sa plage ; les résultats
+    sont ensuite concaténés dans l'ordre du fichier.
+    
+    Args:
+        csv_file_path (str): Chemin du fichier CSV
+        
+    Returns:
+        pd.DataFrame: Données nettoyées avec les colonnes WGS84
+    """
+    names = list(pd.read_csv(csv_file_path, nrows=0, encoding='utf-8').columns)
+    ranges = _split_csv_ranges(csv_file_path, os.cpu_count() or 1)
+    
+    # Processus démarrés par "spawn" (et non "fork") : le chargement est lancé
+    # depuis le thread de travail de l'interface, alors que d'autres threads
+    # (Tk, Numba) peuvent tourner ; un fork les copierait dans un état incohérent
+    with ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn')) as executor:
+        futures = [
+            executor.submit(_parse_csv_range, csv_file_path, names, start, end)
+            for start, end in ranges
+        ]
+        chunks = [future.result() for future in futures]
+    
+    if not chunks:
+        df = pd.DataFrame(columns=CSV_COLUMNS)
+        _add_wgs84_columns(df)
+        return df
+    return pd.concat(chunks, ignore_index=True)
 
 
 class DataManager:
@@ -33,7 +209,24 @@ class DataManager:
             csv_file_path (str): Chemin vers le fichier CSV des PR
         """
         self.csv_file_path = csv_file_path
-        self.pr_data = []
+        
+        # Données stockées par colonnes (tableaux numpy parallèles) :
+        # le PR n°i est (codeCI[i], codeCH[i], libelleCI[i], x[i], y[i])
+        self.codeCI = np.empty(0, dtype=object)
+        self.codeCH = np.empty(0, dtype=object)
+        self.libelleCI = np.empty(0, dtype=object)
+        self.x = np.empty(0, dtype=np.float32)      # X en Lambert 93
+        self.y = np.empty(0, dtype=np.float32)      # Y en Lambert 93
+        self.lats = np.empty(0, dtype=np.float64)   # Latitude WGS84
+        self.lons = np.empty(0, dtype=np.float64)   # Longitude WGS84
+        
+        # Index de recherche par codes (positions des PR dans les colonnes).
+        # pr_index est public : (codeCI, codeCH) -> position, pour vérifier
+        # l'existence d'un PR ou lire ses colonnes sans créer d'objet PR
+        self.pr_index = {}
+        self._index_ci = {}
+        self._index_ch = {}
+        
         self.load_data()
     
     def load_data(self) -> bool:
@@ -46,42 +239,221 @@ class DataManager:
         - libelleCI : Libellé descriptif
         - XLambert93 : Coordonnée X en Lambert 93
         - YLambert93 : Coordonnée Y en Lambert 93
+        
+        La lecture est confiée au parseur C de pandas (voir _parse_csv).
+        Les coordonnées WGS84 sont calculées dans la foulée (latWGS84, lonWGS84).
+        
+        Le résultat est conservé dans un cache Feather à côté du CSV : tant
+        que le CSV n'est pas modifié, les lancements suivants relisent ce
+        cache au lieu de refaire lecture, nettoyage et conversion.
         """
         try:
-            with open(self.csv_file_path, 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                
-                for row in reader:
-                    # Nettoyer les données (supprimer espaces et guillemets)
-                    cleaned_row = {
-                        'codeCI': row['codeCI'].strip().strip('"'),
-                        'codeCH': row['codeCH'].strip().strip('"'),
-                        'libelleCI': row['libelleCI'].strip().strip('"'),
-                        'XLambert93': float(row['XLambert93'].strip().strip('"').replace(',', '.')),
-                        'YLambert93': float(row['YLambert93'].strip().strip('"').replace(',', '.'))
-                    }
-                    self.pr_data.append(cleaned_row)
-                    
-            print(f"[OK] {len(self.pr_data)} Points de Reference charges avec succes")
+            df = self._load_cache()
+            
+            if df is None:
+                df = self._parse_csv()
+                self._save_cache(df)
+            
+            self._set_columns(df)
+            print(f"[OK] {len(df)} Points de Reference charges avec succes")
             return True
             
         except FileNotFoundError:
             print(f"[ERREUR] Fichier {self.csv_file_path} non trouve")
-            self.pr_data = []
+            self._set_columns(_empty_dataframe())
             return False
         except Exception as e:
             print(f"[ERREUR] Erreur lors du chargement : {e}")
-            self.pr_data = []
+            self._set_columns(_empty_dataframe())
             return False
     
-    def get_all_pr(self) -> List[Dict]:
+    def _parse_csv(self) -> pd.DataFrame:
+        """
+        Lit le fichier CSV et calcule les coordonnées WGS84.
+        
+        Les fichiers de plus de PARALLEL_LOAD_THRESHOLD octets sont lus en
+        parallèle (voir _read_csv_parallel) ; les autres par blocs.
+        
+        Returns:
+            pd.DataFrame: Données nettoyées avec les colonnes WGS84
+        """
+        if os.path.getsize(self.csv_file_path) > PARALLEL_LOAD_THRESHOLD:
+            return _read_csv_parallel(self.csv_file_path)
+        
+        df = self._read_csv()
+        
+        # Convertir une seule fois toutes les coordonnées en WGS84 :
+        # les cartes suivantes réutilisent ces colonnes sans appel à PROJ
+        _add_wgs84_columns(df)
+        return df
+    
+    def _read_csv(self) -> pd.DataFrame:
+        """
+        Lit le fichier CSV par blocs de CSV_CHUNK_SIZE lignes.
+        
+        Les colonnes sont typées dès la lecture (virgule décimale pour les
+        coordonnées) et chaque bloc est nettoyé dès qu'il est lu : seules les
+        chaînes nettoyées sont conservées, jamais le fichier brut en entier.
+        
+        Returns:
+            pd.DataFrame: Données nettoyées (sans les colonnes WGS84)
+        """
+        chunks = []
+        with pd.read_csv(self.csv_file_path, chunksize=CSV_CHUNK_SIZE, **CSV_READ_OPTIONS) as reader:
+            for chunk in reader:
+                _clean_text_columns(chunk)
+                chunks.append(chunk)
+        
+        if not chunks:
+            return pd.DataFrame(columns=CSV_COLUMNS)
+        return pd.concat(chunks, ignore_index=True)
+    
+    def _get_cache_path(self) -> str:
+        """
+        Retourne le chemin du cache Feather associé au fichier CSV.
+        
+        Returns:
+            str: Chemin du cache (chemin du CSV + CACHE_EXTENSION)
+        """
+        return self.csv_file_path + CACHE_EXTENSION
+    
+    def _load_cache(self) -> pd.DataFrame:
+        """
+        Relit les données depuis le cache Feather s'il est à jour.
+        
+        Le cache est ignoré s'il n'existe pas, s'il est plus ancien que le
+        fichier CSV ou s'il ne peut pas être lu (pyarrow absent par exemple).
+        
+        Returns:
+            pd.DataFrame: Données du cache, ou None s'il faut relire le CSV
+        """
+        cache_path = self._get_cache_path()
+        
+        # Un CSV absent lève FileNotFoundError, comme lors d'une lecture directe
+        csv_mtime = os.path.getmtime(self.csv_file_path)
+        if not os.path.exists(cache_path) or os.path.getmtime(cache_path) < csv_mtime:
+            return None
+        
+        try:
+            df = pd.read_feather(cache_path)
+        except Exception as e:
+            print(f"[INFO] Cache ignore ({cache_path}) : {e}")
+            return None
+        
+        if not set(CSV_COLUMNS + WGS84_COLUMNS).issubset(df.columns):
+            print(f"[INFO] Cache incomplet ignore : {cache_path}")
+            return None
+        
+        print(f"[INFO] Donnees lues depuis le cache : {cache_path}")
+        return df
+    
+    def _save_cache(self, df: pd.DataFrame) -> None:
+        """
+        Écrit les données nettoyées (avec WGS84) dans le cache Feather.
+        
+        Une erreur d'écriture n'empêche pas l'application de fonctionner :
+        le CSV sera simplement relu au prochain lancement.
+        
+        Args:
+            df (pd.DataFrame): Données nettoyées avec les colonnes WGS84
+        """
+        cache_path = self._get_cache_path()
+        try:
+            df.to_feather(cache_path, compression='lz4')
+        except Exception as e:
+            print(f"[INFO] Cache non ecrit ({cache_path}) : {e}")
+    
+    def _set_columns(self, df: pd.DataFrame) -> None:
+        """
+        Remplace les données chargées par les colonnes du tableau fourni.
+        
+        Seuls des tableaux numpy sont conservés (une colonne par champ),
+        puis les index de recherche sont reconstruits.
+        
+        Les coordonnées Lambert 93 sont stockées en float32 (précision de
+        l'ordre du demi-mètre, suffisante pour l'affichage) ; les coordonnées
+        WGS84, calculées à partir des valeurs float64 lues dans le CSV,
+        restent en float64.
+        
+        Args:
+            df (pd.DataFrame): Données nettoyées des PR avec les colonnes WGS84
+        """
+        self.codeCI = df['codeCI'].to_numpy(dtype=object)
+        self.codeCH = df['codeCH'].to_numpy(dtype=object)
+        self.libelleCI = df['libelleCI'].to_numpy(dtype=object)
+        self.x = df['XLambert93'].to_numpy(dtype=np.float32)
+        self.y = df['YLambert93'].to_numpy(dtype=np.float32)
+        self.lats = df['latWGS84'].to_numpy(dtype=np.float64)
+        self.lons = df['lonWGS84'].to_numpy(dtype=np.float64)
+        self._build_indexes()
+    
+    def _build_indexes(self) -> None:
+        """
+        Construit les index de recherche des PR en une seule passe.
+        
+        Les index contiennent des positions dans les colonnes :
+        - pr_index : (codeCI, codeCH) -> position du PR
+        - _index_ci : codeCI -> positions des PR de ce code CI
+        - _index_ch : codeCH -> positions des PR de ce code CH
+        """
+        index_ci_ch = {}
+        index_ci = defaultdict(list)
+        index_ch = defaultdict(list)
+        
+        for position, (codeCI, codeCH) in enumerate(zip(self.codeCI.tolist(), self.codeCH.tolist())):
+            index_ci_ch[(codeCI, codeCH)] = position
+            index_ci[codeCI].append(position)
+            index_ch[codeCH].append(position)
+        
+        self.pr_index = index_ci_ch
+        self._index_ci = index_ci
+        self._index_ch = index_ch
+    
+    def _get_pr(self, position: int) -> PR:
+        """
+        Reconstruit le PR situé à une position donnée des colonnes.
+        
+        Args:
+            position (int): Position du PR
+            
+        Returns:
+            PR: Point de Référence
+        """
+        return PR(
+            self.codeCI[position],
+            self.codeCH[position],
+            self.libelleCI[position],
+            float(self.x[position]),
+            float(self.y[position]),
+            float(self.lats[position]),
+            float(self.lons[position])
+        )
+    
+    def iter_pr(self) -> Iterator[PR]:
+        """
+        Parcourt tous les Points de Référence sans construire de liste.
+        
+        Returns:
+            Iterator[PR]: Générateur de PR
+        """
+        return map(PR._make, zip(
+            self.codeCI.tolist(),
+            self.codeCH.tolist(),
+            self.libelleCI.tolist(),
+            self.x.tolist(),
+            self.y.tolist(),
+            self.lats.tolist(),
+            self.lons.tolist()
+        ))
+    
+    def get_all_pr(self) -> List[PR]:
         """
         Retourne tous les Points de Référence.
         
         Returns:
-            List[Dict]: Liste de tous les PR avec leurs données
+            List[PR]: Liste de tous les PR avec leurs données
         """
-        return self.pr_data
+        return list(self.iter_pr())
     
     def get_pr_count(self) -> int:
         """
@@ -90,9 +462,9 @@ class DataManager:
         Returns:
             int: Nombre de PR chargés
         """
-        return len(self.pr_data)
+        return len(self.codeCI)
     
-    def search_pr_by_codes(self, codeCI: str = None, codeCH: str = None) -> List[Dict]:
+    def search_pr_by_codes(self, codeCI: str = None, codeCH: str = None) -> List[PR]:
         """
         Recherche des PR par codes CI et/ou CH.
         
@@ -101,43 +473,49 @@ class DataManager:
             codeCH (str, optional): Code CH à rechercher
             
         Returns:
-            List[Dict]: Liste des PR correspondants
+            List[PR]: Liste des PR correspondants
         """
-        results = []
+        # Les deux codes : accès direct dans l'index (CI, CH)
+        if codeCI is not None and codeCH is not None:
+            position = self.pr_index.get((codeCI, codeCH))
+            return [self._get_pr(position)] if position is not None else []
         
-        for pr in self.pr_data:
-            match_ci = codeCI is None or pr['codeCI'] == codeCI
-            match_ch = codeCH is None or pr['codeCH'] == codeCH
-            
-            if match_ci and match_ch:
-                results.append(pr)
+        # Un seul code : liste des PR partageant ce code
+        if codeCI is not None:
+            return [self._get_pr(position) for position in self._index_ci.get(codeCI, [])]
+        if codeCH is not None:
+            return [self._get_pr(position) for position in self._index_ch.get(codeCH, [])]
         
-        return results
+        # Aucun critère : tous les PR
+        return self.get_all_pr()
+    
+    def get_wgs84_for_map(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Retourne les coordonnées WGS84 précalculées de tous les PR.
+        
+        Les tableaux sont dans le même ordre que get_coordinates_for_map().
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (latitudes, longitudes) en WGS84
+        """
+        return self.lats, self.lons
     
     def get_coordinates_for_map(self) -> List[Tuple[float, float, str, str, str]]:
         """
         Retourne les coordonnées formatées pour la cartographie.
         
         Returns:
-            List[Tuple]: Liste de tuples (lat, lon, codeCI, codeCH, libelle)
+            List[Tuple]: Liste de tuples (x, y, codeCI, codeCH, libelle) en Lambert 93
         """
-        coordinates = []
-        
-        for pr in self.pr_data:
-            # Les coordonnées sont déjà en Lambert 93
-            # Pour Leaflet, on peut les utiliser directement
-            x = pr['XLambert93']
-            y = pr['YLambert93']
-            
-            coordinates.append((
-                x,  # X en Lambert 93 (abscisse)
-                y,  # Y en Lambert 93 (ordonnée)
-                pr['codeCI'],
-                pr['codeCH'],
-                pr['libelleCI']
-            ))
-        
-        return coordinates
+        # Les coordonnées sont déjà en Lambert 93 : un seul zip sur les colonnes
+        # remplace la boucle Python ligne par ligne
+        return list(zip(
+            self.x.tolist(),  # X en Lambert 93 (abscisse)
+            self.y.tolist(),  # Y en Lambert 93 (ordonnée)
+            self.codeCI.tolist(),
+            self.codeCH.tolist(),
+            self.libelleCI.tolist()
+        ))
 
 
 # Test du module si execute directement
@@ -153,6 +531,6 @@ if __name__ == "__main__":
     # Afficher les 5 premiers PR
     print("\nPremiers PR :")
     for i, pr in enumerate(dm.get_all_pr()[:5]):
-        print(f"  {i+1}. {pr['codeCI']}-{pr['codeCH']} : {pr['libelleCI']}")
+        print(f"  {i+1}. {pr.codeCI}-{pr.codeCH} : {pr.libelleCI}")
     
     print("\n[OK] Test termine")
@@ -12,12 +12,70 @@ Version: 1.0
 
 import folium
 import folium.plugins
+import hashlib
 import os
-from pyproj import Transformer
+import shutil
 from typing import List, Tuple
 from .data_manager import DataManager
 
 
+# Nombre de cartes conservées dans le cache output/cache_*.html (les plus
+# récemment utilisées ; les autres sont supprimées)
+MAP_CACHE_SIZE = 20
+
+# Version du rendu des cartes, incluse dans la clé du cache : à incrémenter
+# à chaque modification du popup, des icônes, de la légende...
+MAP_CACHE_VERSION = 1
+
+
+# Modèle HTML du popup d'un PR (rempli avec str.format)
+POPUP_TEMPLATE = (
+    "<div style='font-family: Arial, sans-serif;'>"
+    "<h4>Point Remarquable</h4>"
+    "<p><strong>Libellé:</strong> {libelle}</p>"
+    "<p><strong>PR:</strong> {codeCI}.{codeCH}</p>"
+    "{description}"
+    "</div>"
+)
+
+# Bloc HTML optionnel de la description personnalisée d'un PR
+DESCRIPTION_TEMPLATE = (
+    "<p><strong>Description:</strong><br>"
+    "<span style='color: blue;'>{description}</span></p>"
+)
+
+
+# Fonction JavaScript appelée par FastMarkerCluster pour chaque ligne
+# [lat, lon, infobulle, popup] : le marqueur est créé dans le navigateur,
+# avec une seule icône bleue partagée par tous les PR
+PR_MARKER_CALLBACK = """(function () {
+    var icon = L.AwesomeMarkers.icon({icon: 'info-sign', iconColor: 'white', markerColor: 'blue', prefix: 'fa'});
+    return function (row) {
+        var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+        marker.bindTooltip(row[2]);
+        marker.bindPopup(row[3], {maxWidth: 300});
+        return marker;
+    };
+})()"""
+
+
+def _build_popup_html(libelle: str, codeCI: str, codeCH: str, custom_description: str = None) -> str:
+    """
+    Construit le contenu HTML du popup d'un PR à partir des modèles.
+    
+    Args:
+        libelle (str): Libellé du PR
+        codeCI (str): Code CI du PR
+        codeCH (str): Code CH du PR
+        custom_description (str, optional): Description personnalisée
+        
+    Returns:
+        str: Contenu HTML du popup
+    """
+    description = DESCRIPTION_TEMPLATE.format(description=custom_description) if custom_description else ""
+    return POPUP_TEMPLATE.format(libelle=libelle, codeCI=codeCI, codeCH=codeCH, description=description)
+
+
 class MapGenerator:
     """
     Générateur de cartes interactives pour les Points de Référence.
@@ -40,8 +98,11 @@ class MapGenerator:
         self.output_dir = "output"
         self._create_output_dir()
         
-        # Initialiser le convertisseur de coordonnées Lambert 93 -> WGS84
-        self.transformer = Transformer.from_crs("EPSG:2154", "EPSG:4326", always_xy=True)
+        # Icône des PR sélectionnés, créée une seule fois et partagée par tous
+        # les marqueurs : folium ne la déclare qu'une fois dans la page et
+        # chaque marqueur y fait référence (Marker.SetIcon, folium >= 0.19 ;
+        # avant, seul le dernier marqueur ajouté recevait l'icône partagée)
+        self._icon_selected = folium.Icon(color='red', icon='star', prefix='fa')
     
     def _create_output_dir(self) -> None:
         """
@@ -51,21 +112,6 @@ class MapGenerator:
             os.makedirs(self.output_dir)
             print(f"[OK] Dossier de sortie cree : {self.output_dir}")
     
-    def _lambert93_to_wgs84(self, x: float, y: float) -> Tuple[float, float]:
-        """
-        Convertit les coordonnées Lambert 93 en WGS84 (latitude/longitude).
-        
-        Args:
-            x (float): Coordonnée X en Lambert 93
-            y (float): Coordonnée Y en Lambert 93
-            
-        Returns:
-            Tuple[float, float]: (longitude, latitude) en WGS84
-        """
-        # Utiliser pyproj pour la conversion Lambert 93 -> WGS84
-        lon, lat = self.transformer.transform(x, y)
-        return lat, lon
-    
     def create_map(self, center_lat: float = 46.0, center_lon: float = 2.0, zoom_start: int = 6) -> folium.Map:
         """
         Crée une carte Leaflet centrée sur la France.
@@ -78,6 +124,9 @@ class MapGenerator:
         Returns:
             folium.Map: Carte Leaflet configurée
         """
+        # Libérer la carte précédente avant d'en créer une nouvelle
+        self.map = None
+        
         # Créer la carte avec le fond OpenStreetMap uniquement
         self.map = folium.Map(
             location=[center_lat, center_lon],
@@ -89,72 +138,65 @@ class MapGenerator:
         print("[OK] Carte Leaflet creee avec succes")
         return self.map
     
-    def add_pr_markers(self, max_markers: int = 1000) -> None:
+    def add_pr_markers(self, max_markers: int = 1000, pr_descriptions: dict = None) -> None:
         """
         Ajoute les marqueurs des Points de Référence sur la carte.
         
         Args:
             max_markers (int): Nombre maximum de marqueurs à afficher
+            pr_descriptions (dict, optional): Dictionnaire des descriptions optionnelles {codeCI-codeCH: description}
         """
         if not self.map:
             print("[ERREUR] Carte non initialisee")
             return
         
-        # Récupérer les coordonnées des PR
-        coordinates = self.data_manager.get_coordinates_for_map()
-        
         # Limiter le nombre de marqueurs pour les performances
-        if len(coordinates) > max_markers:
-            print(f"[INFO] Limitation a {max_markers} marqueurs sur {len(coordinates)} PR disponibles")
-            coordinates = coordinates[:max_markers]
+        dm = self.data_manager
+        pr_count = dm.get_pr_count()
+        if pr_count > max_markers:
+            print(f"[INFO] Limitation a {max_markers} marqueurs sur {pr_count} PR disponibles")
+        
+        # Extraire uniquement les colonnes utiles des premiers PR (coordonnées
+        # déjà converties en WGS84 au chargement)
+        lats, lons = dm.get_wgs84_for_map()
+        coordinates = zip(
+            lats[:max_markers].tolist(),
+            lons[:max_markers].tolist(),
+            dm.codeCI[:max_markers].tolist(),
+            dm.codeCH[:max_markers].tolist(),
+            dm.libelleCI[:max_markers].tolist()
+        )
         
-        # Créer un groupe de marqueurs pour l'organisation (masqué par défaut)
-        marker_cluster = folium.plugins.MarkerCluster(
+        # Préparer une simple liste [lat, lon, infobulle, popup] par PR :
+        # aucun objet folium n'est créé par marqueur
+        # Sans description fournie, inutile de chercher une description par PR
+        has_descriptions = bool(pr_descriptions)
+        
+        data = []
+        for lat, lon, codeCI, codeCH, libelle in coordinates:
+            # Vérifier s'il y a une description personnalisée
+            custom_description = pr_descriptions.get(f"{codeCI}-{codeCH}") if has_descriptions else None
+            
+            data.append([
+                lat,
+                lon,
+                f"{codeCI}-{codeCH}: {libelle}",
+                # Popup avec les informations du PR (et la description si elle existe)
+                _build_popup_html(libelle, codeCI, codeCH, custom_description)
+            ])
+        
+        # Regrouper les marqueurs (masqués par défaut) ; les données sont
+        # sérialisées une seule fois et les marqueurs créés côté navigateur
+        folium.plugins.FastMarkerCluster(
+            data,
+            callback=PR_MARKER_CALLBACK,
             name='Points de Référence',
             overlay=True,
             control=True,
             show=False  # Masqué par défaut
         ).add_to(self.map)
         
-        # Ajouter chaque marqueur
-        for lambert_x, lambert_y, codeCI, codeCH, libelle in coordinates:
-            # Convertir les coordonnées Lambert 93 en WGS84
-            lat, lon = self._lambert93_to_wgs84(lambert_x, lambert_y)
-            
-            # Vérifier s'il y a une description personnalisée
-            pr_key = f"{codeCI}-{codeCH}"
-            custom_description = pr_descriptions.get(pr_key, None)
-            
-            # Créer le popup avec les informations du PR
-            popup_text = f"""
-            <div style='font-family: Arial, sans-serif;'>
-                <h4>Point Remarquable</h4>
-                <p><strong>Libellé:</strong> {libelle}</p>
-                <p><strong>PR:</strong> {codeCI}.{codeCH}</p>"""
-            
-            # Ajouter la description personnalisée si elle existe
-            if custom_description:
-                popup_text += f"""
-                <p><strong>Description:</strong><br>
-                <span style='color: blue;'>{custom_description}</span></p>"""
-            
-            popup_text += f"""
-            </div>
-            """
-            
-            # Créer le marqueur
-            folium.Marker(
-                location=[lat, lon],
-                popup=folium.Popup(popup_text, max_width=300),
-                tooltip=f"{codeCI}-{codeCH}: {libelle}",
-                icon=folium.Icon(
-                    color='blue',
-                    icon='info-sign',
-                    prefix='fa'
-                )
-            ).add_to(marker_cluster)
-        
-        print(f"[OK] {len(coordinates)} marqueurs ajoutes a la carte")
+        print(f"[OK] {len(data)} marqueurs ajoutes a la carte")
     
     def add_specific_pr_markers(self, pr_codes: List[Tuple[str, str]], pr_descriptions: dict = None, max_markers: int = 100) -> None:
         """
@@ -173,18 +215,19 @@ class MapGenerator:
         if pr_descriptions is None:
             pr_descriptions = {}
         
-        # Récupérer les coordonnées des PR spécifiés
-        coordinates = []
-        for codeCI, codeCH in pr_codes:
-            prs = self.data_manager.search_pr_by_codes(codeCI=codeCI, codeCH=codeCH)
-            for pr in prs:
-                coordinates.append((
-                    pr['XLambert93'],
-                    pr['YLambert93'],
-                    pr['codeCI'],
-                    pr['codeCH'],
-                    pr['libelleCI']
-                ))
+        # Récupérer les positions des PR spécifiés en une passe dans l'index (CI, CH),
+        # sans doublons (en gardant l'ordre fourni), puis extraire leurs colonnes
+        # d'un seul coup
+        dm = self.data_manager
+        index = dm.pr_index
+        positions = [index[key] for key in dict.fromkeys(pr_codes) if key in index]
+        coordinates = list(zip(
+            dm.lats[positions].tolist(),
+            dm.lons[positions].tolist(),
+            dm.codeCI[positions].tolist(),
+            dm.codeCH[positions].tolist(),
+            dm.libelleCI[positions].tolist()
+        ))
         
         if not coordinates:
             print("[INFO] Aucun PR trouve pour les codes specifies")
@@ -196,41 +239,21 @@ class MapGenerator:
             coordinates = coordinates[:max_markers]
         
         # Ajouter chaque marqueur directement sur la carte (sans couche de contrôle)
-        for lambert_x, lambert_y, codeCI, codeCH, libelle in coordinates:
-            # Convertir les coordonnées Lambert 93 en WGS84
-            lat, lon = self._lambert93_to_wgs84(lambert_x, lambert_y)
-            
+        # Les coordonnées WGS84 ont été calculées une fois pour toutes au chargement
+        for lat, lon, codeCI, codeCH, libelle in coordinates:
             # Vérifier s'il y a une description personnalisée
             pr_key = f"{codeCI}-{codeCH}"
             custom_description = pr_descriptions.get(pr_key, None)
             
-            # Créer le popup avec les informations du PR
-            popup_text = f"""
-            <div style='font-family: Arial, sans-serif;'>
-                <h4>Point Remarquable</h4>
-                <p><strong>Libellé:</strong> {libelle}</p>
-                <p><strong>PR:</strong> {codeCI}.{codeCH}</p>"""
-            
-            # Ajouter la description personnalisée si elle existe
-            if custom_description:
-                popup_text += f"""
-                <p><strong>Description:</strong><br>
-                <span style='color: blue;'>{custom_description}</span></p>"""
-            
-            popup_text += f"""
-            </div>
-            """
+            # Créer le popup avec les informations du PR (et la description si elle existe)
+            popup_text = _build_popup_html(libelle, codeCI, codeCH, custom_description)
             
             # Créer le marqueur directement sur la carte
             folium.Marker(
                 location=[lat, lon],
                 popup=folium.Popup(popup_text, max_width=300),
                 tooltip=f"{codeCI}-{codeCH}: {libelle}",
-                icon=folium.Icon(
-                    color='red',  # Couleur rouge pour les PR sélectionnés
-                    icon='star',
-                    prefix='fa'
-                )
+                icon=self._icon_selected  # Étoile rouge pour les PR sélectionnés
             ).add_to(self.map)
         
         print(f"[OK] {len(coordinates)} marqueurs PR selectionnes ajoutes a la carte")
@@ -274,13 +297,14 @@ class MapGenerator:
         print(f"[OK] Carte sauvegardee : {filepath}")
         return filepath
     
-    def generate_complete_map(self, filename: str = "pr_map.html", max_markers: int = 1000) -> str:
+    def generate_complete_map(self, filename: str = "pr_map.html", max_markers: int = 1000, pr_descriptions: dict = None) -> str:
         """
         Génère une carte complète avec tous les éléments.
         
         Args:
             filename (str): Nom du fichier de sortie
             max_markers (int): Nombre maximum de marqueurs
+            pr_descriptions (dict, optional): Dictionnaire des descriptions optionnelles {codeCI-codeCH: description}
             
         Returns:
             str: Chemin du fichier généré
@@ -291,7 +315,7 @@ class MapGenerator:
         self.create_map()
         
         # Ajouter les marqueurs
-        self.add_pr_markers(max_markers)
+        self.add_pr_markers(max_markers, pr_descriptions)
         
         # Ajouter la légende
         self.add_legend()
@@ -305,7 +329,7 @@ class MapGenerator:
         print("[OK] Carte complete generee avec succes")
         return filepath
     
-    def generate_map_with_specific_pr(self, pr_codes: List[Tuple[str, str]], pr_descriptions: dict = None, filename: str = "pr_specific_map.html") -> str:
+    def generate_map_with_specific_pr(self, pr_codes: List[Tuple[str, str]], pr_descriptions: dict = None, filename: str = "pr_specific_map.html", max_markers: int = 100) -> str:
         """
         Génère une carte avec des PR spécifiques.
         
@@ -313,28 +337,94 @@ class MapGenerator:
             pr_codes (List[Tuple[str, str]]): Liste de tuples (codeCI, codeCH) à afficher
             pr_descriptions (dict): Dictionnaire des descriptions optionnelles {codeCI-codeCH: description}
             filename (str): Nom du fichier de sortie
+            max_markers (int): Nombre maximum de marqueurs à afficher
             
         Returns:
             str: Chemin du fichier généré
+            
+        Note:
+            Chaque carte générée est aussi conservée dans output/ sous le nom
+            cache_<clé>.html. Si les mêmes PR et descriptions sont demandés à
+            nouveau, ce fichier est simplement recopié (voir _get_cache_key).
+            Seules les MAP_CACHE_SIZE cartes les plus récemment utilisées
+            sont gardées.
         """
         print("[INFO] Generation de la carte avec PR specifiques...")
         
+        # Réutiliser une carte déjà générée pour les mêmes PR et descriptions
+        cache_path = os.path.join(self.output_dir, f"cache_{self._get_cache_key(pr_codes, pr_descriptions, max_markers)}.html")
+        if os.path.exists(cache_path):
+            filepath = os.path.join(self.output_dir, filename)
+            shutil.copyfile(cache_path, filepath)
+            os.utime(cache_path)  # Carte récemment utilisée : la garder dans le cache
+            print(f"[OK] Carte reprise du cache : {filepath}")
+            return filepath
+        
         # Créer la carte
         self.create_map()
         
         # Ajouter les marqueurs spécifiques
-        self.add_specific_pr_markers(pr_codes, pr_descriptions)
+        self.add_specific_pr_markers(pr_codes, pr_descriptions, max_markers)
         
         # Ajouter la légende
         self.add_legend()
         
         # Pas de contrôle des couches (interface simplifiée)
         
-        # Sauvegarder
+        # Sauvegarder (et garder une copie pour les prochaines demandes identiques)
         filepath = self.save_map(filename)
+        if filepath:
+            shutil.copyfile(filepath, cache_path)
+            self._prune_map_cache()
         
         print("[OK] Carte avec PR specifiques generee avec succes")
         return filepath
+    
+    def _get_cache_key(self, pr_codes: List[Tuple[str, str]], pr_descriptions: dict = None, max_markers: int = 100) -> str:
+        """
+        Calcule la clé de cache d'une carte de PR spécifiques.
+        
+        Les codes sont pris dans l'ordre fourni : la carte n'affiche que les
+        premiers PR (max_markers), elle dépend donc de cet ordre. La clé change
+        aussi si les descriptions, le fichier de données (date de
+        modification), la limite de marqueurs, la version de folium ou
+        MAP_CACHE_VERSION changent.
+        
+        Args:
+            pr_codes (List[Tuple[str, str]]): Liste de tuples (codeCI, codeCH)
+            pr_descriptions (dict): Dictionnaire des descriptions optionnelles
+            max_markers (int): Nombre maximum de marqueurs affichés
+            
+        Returns:
+            str: Clé hexadécimale de 24 caractères
+        """
+        csv_path = self.data_manager.csv_file_path
+        csv_mtime = os.path.getmtime(csv_path) if os.path.exists(csv_path) else 0
+        
+        key = hashlib.blake2b(digest_size=12)
+        key.update(repr(list(pr_codes)).encode('utf-8'))
+        key.update(repr(sorted((pr_descriptions or {}).items())).encode('utf-8'))
+        key.update(repr((csv_path, csv_mtime)).encode('utf-8'))
+        key.update(repr((MAP_CACHE_VERSION, folium.__version__, max_markers)).encode('utf-8'))
+        return key.hexdigest()
+    
+    def _prune_map_cache(self) -> None:
+        """
+        Supprime les cartes du cache au-delà des MAP_CACHE_SIZE plus récentes.
+        """
+        cache_files = [
+            entry for entry in os.scandir(self.output_dir)
+            if entry.name.startswith("cache_") and entry.name.endswith(".html")
+        ]
+        if len(cache_files) <= MAP_CACHE_SIZE:
+            return
+        
+        cache_files.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for entry in cache_files[MAP_CACHE_SIZE:]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass  # Fichier déjà supprimé ou verrouillé : on réessaiera plus tard
 
 
 # Test du module si execute directement
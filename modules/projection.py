@@ -0,0 +1,150 @@
+"""
+Module de conversion de coordonnées pour JBW Viewer
+===================================================
+
+Ce module convertit les coordonnées Lambert 93 (EPSG:2154) du fichier
+des PR en coordonnées WGS84 (EPSG:4326, latitude/longitude) utilisées
+par Leaflet.
+
+La conversion (lambert93_to_wgs84) applique la formule inverse de la
+projection conique conforme de Lambert (IGN, notes ALG0001 et ALG0004)
+à des tableaux numpy. Pour de très gros tableaux, sur une machine à
+plusieurs processeurs, elle est compilée avec Numba lorsque cette
+librairie est installée.
+
+Auteur: Assistant IA
+Date: 2025
+Version: 1.0
+"""
+
+import os
+
+import numpy as np
+from typing import Callable, Tuple
+
+
+# Constantes de la projection Lambert 93 (ellipsoïde GRS80)
+L93_N = 0.7256077650532670        # Exposant de la projection
+L93_C = 11754255.426096           # Constante de la projection (m)
+L93_XS = 700000.0                 # Coordonnée X du pôle (m)
+L93_YS = 12655612.049876          # Coordonnée Y du pôle (m)
+L93_LON0 = np.radians(3.0)        # Méridien central : 3° Est de Greenwich
+GRS80_E = 0.0818191910428158      # Première excentricité de l'ellipsoïde GRS80
+
+# Nombre d'itérations du calcul de la latitude (précision < 1e-11 radian)
+LATITUDE_ITERATIONS = 6
+
+# Nombre de points à partir duquel la formule est compilée avec Numba :
+# en dessous, numpy est plus rapide que l'import et la compilation (~1 s)
+NUMBA_MIN_POINTS = 1_000_000
+
+# Numba n'apporte rien sur un seul processeur : la formule étant écrite en
+# opérations sur tableaux, la version compilée n'y est pas plus rapide que
+# numpy (mesuré : 0,31 s contre 0,18 s pour 1 million de points). Seule la
+# répartition du calcul entre processeurs (parallel=True) peut la rentabiliser
+USE_NUMBA = (os.cpu_count() or 1) > 1
+
+
+# Version compilée de la formule (créée au premier gros calcul, voir _get_compiled)
+_compiled_inverse = None
+
+
+def _lambert93_inverse(xs: np.ndarray, ys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Formule inverse de la projection Lambert 93 (coordonnées en mètres).
+    
+    La latitude est obtenue à partir de la latitude isométrique par
+    itérations successives (note IGN ALG0001).
+    
+    Args:
+        xs (np.ndarray): Coordonnées X en Lambert 93 (float64)
+        ys (np.ndarray): Coordonnées Y en Lambert 93 (float64)
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (latitudes, longitudes) en degrés
+    """
+    dx = xs - L93_XS
+    dy = L93_YS - ys
+    
+    # Longitude : angle au pôle de la projection
+    lons = L93_LON0 + np.arctan2(dx, dy) / L93_N
+    
+    # Latitude isométrique, puis latitude géographique par itérations
+    exp_iso = np.exp(-np.log(np.sqrt(dx * dx + dy * dy) / L93_C) / L93_N)
+    lats = 2.0 * np.arctan(exp_iso) - np.pi / 2.0
+    for _ in range(LATITUDE_ITERATIONS):
+        e_sin = GRS80_E * np.sin(lats)
+        lats = 2.0 * np.arctan(((1.0 + e_sin) / (1.0 - e_sin)) ** (GRS80_E / 2.0) * exp_iso) - np.pi / 2.0
+    
+    return np.degrees(lats), np.degrees(lons)
+
+
+def _get_compiled() -> Callable:
+    """
+    Retourne la formule inverse compilée en code machine (parallélisé).
+    
+    Numba n'est importé qu'ici, au premier gros calcul : le démarrage de
+    l'application n'en paie pas le coût. Sans Numba, la version numpy est
+    retournée.
+    
+    Returns:
+        Callable: Fonction de même signature que _lambert93_inverse
+    """
+    global _compiled_inverse
+    if _compiled_inverse is None:
+        try:
+            from numba import njit
+        except ImportError:  # Numba est optionnel : la formule reste vectorisée par numpy
+            _compiled_inverse = _lambert93_inverse
+        else:
+            _compiled_inverse = njit(parallel=True, fastmath=True, cache=True)(_lambert93_inverse)
+    return _compiled_inverse
+
+
+def lambert93_to_wgs84(xs: np.ndarray, ys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convertit des tableaux de coordonnées Lambert 93 en WGS84.
+    
+    Tous les points sont convertis en un seul appel : la formule inverse
+    de Lambert est appliquée directement aux tableaux (compilée avec Numba
+    au-delà de NUMBA_MIN_POINTS points si USE_NUMBA est vrai).
+    Le RGF93 (référentiel du Lambert 93) et le WGS84 coïncident à l'échelle
+    de la carte (écart inférieur au mètre).
+    
+    Args:
+        xs (np.ndarray): Coordonnées X en Lambert 93
+        ys (np.ndarray): Coordonnées Y en Lambert 93
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (latitudes, longitudes) en WGS84
+    """
+    xs = np.ascontiguousarray(xs, dtype=np.float64)
+    ys = np.ascontiguousarray(ys, dtype=np.float64)
+    if USE_NUMBA and xs.size >= NUMBA_MIN_POINTS:
+        return _get_compiled()(xs, ys)
+    return _lambert93_inverse(xs, ys)
+
+
+# Test du module si execute directement
+if __name__ == "__main__":
+    print("[TEST] Test du module projection")
+    
+    # Points de contrôle : origine de la projection (46,5° N ; 3° E par
+    # définition du Lambert 93) et PR 597120-BA (Argenton-sur-Creuse,
+    # valeurs de référence obtenues avec PROJ, EPSG:2154 -> EPSG:4326)
+    xs = np.array([700000.0, 584969.028])
+    ys = np.array([6600000.0, 6613345.552])
+    expected_lats = np.array([46.5, 46.61031019729366])
+    expected_lons = np.array([3.0, 1.4969163021490872])
+    
+    lats, lons = lambert93_to_wgs84(xs, ys)
+    for lat, lon, expected_lat, expected_lon in zip(lats, lons, expected_lats, expected_lons):
+        print(f"[INFO] lat={lat:.9f} lon={lon:.9f} (attendu {expected_lat:.9f}, {expected_lon:.9f})")
+    
+    # 1e-9 degré : environ 0,1 mm au sol
+    if np.allclose(lats, expected_lats, atol=1e-9) and np.allclose(lons, expected_lons, atol=1e-9):
+        print("[OK] Conversion Lambert 93 -> WGS84 correcte")
+    else:
+        print("[ERREUR] Ecart de conversion Lambert 93 -> WGS84")
+    
+    print(f"[INFO] Compilation Numba : {'activee' if USE_NUMBA else 'desactivee'} ({os.cpu_count()} processeur(s))")
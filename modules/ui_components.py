@@ -10,14 +10,173 @@ Version: 1.0
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
-import webbrowser
+from tkinter import ttk, messagebox
 import os
-from typing import Callable
+import functools
+import re
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
 from .data_manager import DataManager
 from .map_generator import MapGenerator
 
 
+# Intervalle (ms) de vérification des tâches exécutées en arrière-plan
+BACKGROUND_POLL_MS = 50
+
+# Délai (ms) de regroupement des mises à jour successives du statut
+STATUS_FLUSH_MS = 50
+
+# Historique de la zone d'informations : au-delà de INFO_MAX_LINES lignes,
+# les INFO_TRIM_LINES plus anciennes sont supprimées
+INFO_MAX_LINES = 500
+INFO_TRIM_LINES = 100
+
+# Fichier CSV des Points de Référence
+CSV_FILE_PATH = "data/TTH_EXPLORER_REFERENTIEL_PR.csv"
+
+# Ligne de code PR : "codeCI-codeCH" suivi d'une description optionnelle
+# ";description". Toute autre ligne non vide est capturée dans "invalid".
+# ([^\S\n] désigne un espace ou une tabulation, sans changer de ligne)
+_PR_LINE_RE = re.compile(
+    r'^[^\S\n]*(?:'
+    r'(?P<ci>[^-;\n]*?)[^\S\n]*-[^\S\n]*(?P<ch>[^;\n]*?)[^\S\n]*'
+    r'(?:;[^\S\n]*(?P<desc>[^\n]*?))?'
+    r'|(?P<invalid>\S[^\n]*?)'
+    r')[^\S\n]*$',
+    re.MULTILINE
+)
+
+
+def _get_style(root: tk.Tk) -> ttk.Style:
+    """
+    Retourne le style ttk d'une fenêtre, créé et configuré une seule fois.
+    
+    Un style appartient à l'interpréteur Tcl de sa fenêtre : il est donc
+    mémorisé sur la fenêtre elle-même (attribut _jbw_style), et chaque
+    nouvelle fenêtre reçoit le sien. Le thème 'clam' est activé et le
+    style 'JBW.TButton', utilisé par tous les boutons, est défini à cette
+    occasion.
+    
+    Args:
+        root (tk.Tk): Fenêtre principale
+        
+    Returns:
+        ttk.Style: Style de la fenêtre
+    """
+    style = getattr(root, '_jbw_style', None)
+    if style is None:
+        style = ttk.Style(root)
+        style.theme_use('clam')
+        style.configure('JBW.TButton', padding=5)
+        root._jbw_style = style
+    return style
+
+
+def _parse_pr_codes(pr_text: str) -> Tuple[List[Tuple[str, str]], Dict[str, str], List[str]]:
+    """
+    Analyse les codes PR saisis (un par ligne, description optionnelle).
+    
+    Tout le texte est analysé en un seul passage de l'expression régulière
+    _PR_LINE_RE ; les lignes vides sont ignorées.
+    
+    Args:
+        pr_text (str): Texte contenant les codes PR (codeCI-codeCH;description)
+        
+    Returns:
+        Tuple[List[Tuple[str, str]], Dict[str, str], List[str]]:
+            (codes (codeCI, codeCH), descriptions {codeCI-codeCH: description},
+            lignes invalides "Ligne n: contenu")
+    """
+    pr_codes = []
+    pr_descriptions = {}
+    invalid_lines = []
+    
+    # Numéro de ligne tenu à jour depuis la ligne invalide précédente, pour
+    # ne pas recompter les sauts de ligne depuis le début du texte
+    line_num = 1
+    line_pos = 0
+    
+    for match in _PR_LINE_RE.finditer(pr_text):
+        invalid = match.group('invalid')
+        if invalid is not None:
+            line_num += pr_text.count('\n', line_pos, match.start())
+            line_pos = match.start()
+            invalid_lines.append(f"Ligne {line_num}: {invalid}")
+            continue
+        
+        codeCI, codeCH, description = match.group('ci', 'ch', 'desc')
+        pr_codes.append((codeCI, codeCH))
+        if description:
+            pr_descriptions[f"{codeCI}-{codeCH}"] = description
+    
+    return pr_codes, pr_descriptions, invalid_lines
+
+
+def _read_pr_file(file_path: str) -> Tuple[str, int]:
+    """
+    Lit un fichier de codes PR en un seul passage.
+    
+    Les lignes sont parcourues une à une : le texte est reconstitué et les
+    codes valides (lignes contenant un tiret) sont comptés au fil de la lecture.
+    
+    Args:
+        file_path (str): Chemin vers le fichier de codes PR
+        
+    Returns:
+        Tuple[str, int]: (contenu du fichier sans espaces de début et de fin,
+            nombre de codes PR valides)
+    """
+    lines = []
+    valid_count = 0
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            lines.append(line)
+            if '-' in line:
+                valid_count += 1
+    
+    return "".join(lines).strip(), valid_count
+
+
+@functools.lru_cache(maxsize=4)
+def _get_data_manager(csv_path: str, mtime: float) -> DataManager:
+    """
+    Retourne le gestionnaire de données d'un fichier CSV, chargé une seule fois.
+    
+    La date de modification fait partie de la clé du cache : un rechargement
+    ne relit le fichier que s'il a changé depuis le dernier chargement.
+    
+    Args:
+        csv_path (str): Chemin vers le fichier CSV des PR
+        mtime (float): Date de modification du fichier (None s'il n'existe pas)
+        
+    Returns:
+        DataManager: Gestionnaire de données chargé
+    """
+    return DataManager(csv_path)
+
+
+def _load_data_manager(csv_path: str = CSV_FILE_PATH) -> DataManager:
+    """
+    Charge (ou reprend du cache) le gestionnaire de données du fichier CSV.
+    
+    Args:
+        csv_path (str): Chemin vers le fichier CSV des PR
+        
+    Un chargement échoué (fichier verrouillé, illisible...) donne un
+    gestionnaire vide : il n'est pas gardé en cache, pour que le bouton
+    "Recharger" relise le fichier même si sa date n'a pas changé.
+    
+    Returns:
+        DataManager: Gestionnaire de données chargé
+    """
+    mtime = os.path.getmtime(csv_path) if os.path.exists(csv_path) else None
+    data_manager = _get_data_manager(csv_path, mtime)
+    if data_manager.get_pr_count() == 0:
+        _get_data_manager.cache_clear()
+    return data_manager
+
+
 class JBWViewerUI:
     """
     Interface utilisateur principale de l'application JBW Viewer.
@@ -35,6 +194,33 @@ class JBWViewerUI:
         self.root = tk.Tk()
         self.data_manager = None
         self.map_generator = None
+        
+        # Thread de travail unique pour les traitements longs (chargement des
+        # données, génération de cartes)
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        
+        # Chargement des données en cours, et actions qui attendent sa fin
+        self._data_loading = False
+        self._pending_after_load = []
+        
+        # Dernier message de statut pas encore affiché (voir update_status)
+        self._status_pending = None
+        
+        # Messages d'information pas encore affichés (voir add_info)
+        self._info_buf = []
+        
+        # Profondeur des blocs _suspend_ui_updates en cours
+        self._batching = 0
+        
+        # Widgets de la section de carte complète (voir create_map_section)
+        self.generate_btn_bulk = None
+        self.open_btn_bulk = None
+        self.map_status_bulk = None
+        
+        # Cartes générées par section de l'interface ("pr" : carte complète,
+        # "specific" : PR spécifiques) : (chemin, nom du fichier, URL)
+        self._maps = {}
+        
         self.setup_ui()
         
         # Charger automatiquement les données au démarrage
@@ -43,27 +229,114 @@ class JBWViewerUI:
     def auto_load_data(self) -> None:
         """
         Charge automatiquement les données au démarrage de l'application.
+        
+        La lecture du CSV se fait dans le thread de travail : la fenêtre
+        s'affiche et reste réactive pendant le chargement.
+        """
+        self.update_status("Chargement automatique des données...")
+        self._start_data_loading(reload=False)
+    
+    def _start_data_loading(self, reload: bool) -> None:
         """
+        Lance le chargement des données CSV en arrière-plan.
+        
+        Args:
+            reload (bool): True pour un rechargement manuel, False au démarrage
+        """
+        self._data_loading = True
+        self.load_btn.config(state='disabled')
+        self._run_in_background(
+            _load_data_manager,
+            lambda future: self._on_data_loaded(future, reload)
+        )
+    
+    def _on_data_loaded(self, future: Future, reload: bool) -> None:
+        """
+        Termine le chargement des données : met à jour l'interface puis exécute
+        les actions qui attendaient les données (voir _when_data_loaded).
+        
+        Args:
+            future (Future): Tâche de chargement terminée
+            reload (bool): True pour un rechargement manuel, False au démarrage
+        """
+        # Modifications des widgets, appliquées ensemble à la fin (voir _apply)
+        updates = {self.load_btn: {'state': 'normal'}}
+        
         try:
-            self.update_status("Chargement automatique des données...")
-            self.data_manager = DataManager()
+            self.data_manager = future.result()
+            
+            # Un seul générateur de cartes, réutilisé pour chaque génération
+            self.map_generator = MapGenerator(self.data_manager)
             
             if self.data_manager.get_pr_count() > 0:
-                # Mettre à jour l'interface pour refléter le chargement automatique
-                self.data_status.config(text="✅ Données chargées automatiquement")
-                self.data_info.config(text=f"{self.data_manager.get_pr_count()} Points de Référence disponibles")
-                self.generate_btn.config(state='normal')
-                self.search_btn.config(state='normal')
-                self.add_info(f"✅ {self.data_manager.get_pr_count()} Points de Référence chargés automatiquement au démarrage")
+                updates[self.data_info] = {'text': f"{self.data_manager.get_pr_count()} Points de Référence disponibles"}
+                updates[self.generate_btn] = {'state': 'normal'}
+                if self.generate_btn_bulk is not None:
+                    updates[self.generate_btn_bulk] = {'state': 'normal'}
+                updates[self.search_btn] = {'state': 'normal'}
+                if reload:
+                    updates[self.data_status] = {'text': "✅ Données rechargées"}
+                    self.add_info(f"✅ {self.data_manager.get_pr_count()} Points de Référence rechargés avec succès")
+                else:
+                    # Mettre à jour l'interface pour refléter le chargement automatique
+                    updates[self.data_status] = {'text': "✅ Données chargées automatiquement"}
+                    self.add_info(f"✅ {self.data_manager.get_pr_count()} Points de Référence chargés automatiquement au démarrage")
+            elif reload:
+                updates[self.data_status] = {'text': "❌ Erreur de rechargement"}
+                self.add_info("❌ Aucune donnée rechargée")
             else:
-                self.data_status.config(text="❌ Erreur de chargement automatique")
+                updates[self.data_status] = {'text': "❌ Erreur de chargement automatique"}
                 self.add_info("❌ Aucune donnée chargée automatiquement")
                 
         except Exception as e:
-            self.data_status.config(text="❌ Erreur de chargement automatique")
-            self.add_info(f"❌ Erreur lors du chargement automatique : {e}")
+            if reload:
+                messagebox.showerror("Erreur", f"Erreur lors du rechargement : {e}")
+                self.add_info(f"❌ Erreur : {e}")
+            else:
+                updates[self.data_status] = {'text': "❌ Erreur de chargement automatique"}
+                self.add_info(f"❌ Erreur lors du chargement automatique : {e}")
         finally:
-            self.update_status("Prêt - Données chargées")
+            self._data_loading = False
+            self._apply(updates)
+            self.update_status("Prêt - Données rechargées" if reload else "Prêt - Données chargées")
+        
+        # Exécuter les actions mises en attente pendant le chargement
+        pending, self._pending_after_load = self._pending_after_load, []
+        for action in pending:
+            action()
+    
+    def _apply(self, updates: Dict[tk.Widget, dict]) -> None:
+        """
+        Applique un ensemble de modifications de widgets en une seule fois.
+        
+        Les modifications sont regroupées dans un unique rappel after_idle,
+        exécuté lors du prochain passage de la boucle Tk.
+        
+        Args:
+            updates (Dict[tk.Widget, dict]): Options de configure() par widget,
+                par exemple {self.generate_btn: {'state': 'normal'}}
+        """
+        def apply_updates():
+            for widget, options in updates.items():
+                widget.configure(**options)
+        
+        self.root.after_idle(apply_updates)
+    
+    def _when_data_loaded(self, action: Callable[[], None]) -> bool:
+        """
+        Diffère une action jusqu'à la fin du chargement des données en cours.
+        
+        Args:
+            action (Callable[[], None]): Action à exécuter après le chargement
+            
+        Returns:
+            bool: True si l'action a été différée, False si aucun chargement
+                n'est en cours (l'appelant peut alors continuer)
+        """
+        if not self._data_loading:
+            return False
+        self._pending_after_load.append(action)
+        return True
     
     def setup_ui(self) -> None:
         """
@@ -74,9 +347,8 @@ class JBWViewerUI:
         self.root.geometry("600x500")
         self.root.resizable(True, True)
         
-        # Style de l'interface
-        style = ttk.Style()
-        style.theme_use('clam')
+        # Style de l'interface (créé une seule fois)
+        _get_style(self.root)
         
         # Créer le conteneur principal
         main_frame = ttk.Frame(self.root, padding="10")
@@ -119,6 +391,7 @@ class JBWViewerUI:
         # Bouton de rechargement des données
         self.load_btn = ttk.Button(
             data_frame,
+            style='JBW.TButton',
             text="Recharger les données CSV",
             command=self.load_data
         )
@@ -134,7 +407,10 @@ class JBWViewerUI:
     
     def create_map_section(self, parent: ttk.Frame) -> None:
         """
-        Crée la section de génération de cartes.
+        Crée la section de génération de la carte complète (tous les PR).
+        
+        Cette section n'est pas affichée par setup_ui. Ses widgets portent le
+        suffixe _bulk pour ne pas remplacer ceux de la section des PR spécifiques.
         
         Args:
             parent: Widget parent
@@ -154,26 +430,28 @@ class JBWViewerUI:
         max_markers_entry.grid(row=0, column=1, padx=(0, 20))
         
         # Bouton de génération de carte
-        self.generate_btn = ttk.Button(
+        self.generate_btn_bulk = ttk.Button(
             controls_frame,
+            style='JBW.TButton',
             text="Générer la carte",
             command=self.generate_map,
             state='disabled'
         )
-        self.generate_btn.grid(row=0, column=2)
+        self.generate_btn_bulk.grid(row=0, column=2)
         
         # Bouton d'ouverture de la carte
-        self.open_btn = ttk.Button(
+        self.open_btn_bulk = ttk.Button(
             controls_frame,
+            style='JBW.TButton',
             text="Ouvrir la carte",
             command=self.open_map,
             state='disabled'
         )
-        self.open_btn.grid(row=0, column=3, padx=(10, 0))
+        self.open_btn_bulk.grid(row=0, column=3, padx=(10, 0))
         
         # Statut de la carte
-        self.map_status = ttk.Label(map_frame, text="Aucune carte générée")
-        self.map_status.grid(row=1, column=0, columnspan=2, pady=(5, 0))
+        self.map_status_bulk = ttk.Label(map_frame, text="Aucune carte générée")
+        self.map_status_bulk.grid(row=1, column=0, columnspan=2, pady=(5, 0))
     
     def create_specific_pr_section(self, parent: ttk.Frame) -> None:
         """
@@ -199,13 +477,16 @@ class JBWViewerUI:
         # Bouton pour charger un fichier
         self.load_file_btn = ttk.Button(
             title_frame,
+            style='JBW.TButton',
             text="Charger depuis fichier",
             command=self.load_pr_from_file
         )
         self.load_file_btn.grid(row=0, column=1, padx=(10, 0))
         
         # Zone de texte pour saisir les codes
-        self.pr_codes_text = tk.Text(input_frame, height=4, width=50, wrap=tk.WORD)
+        # Sans historique d'annulation : les listes chargées depuis un fichier
+        # peuvent être longues, et leur insertion n'a pas à être enregistrée
+        self.pr_codes_text = tk.Text(input_frame, height=4, width=50, wrap=tk.WORD, undo=False, autoseparators=False)
         self.pr_codes_text.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(5, 0))
         
         # Scrollbar pour la zone de texte
@@ -220,6 +501,7 @@ class JBWViewerUI:
         # Bouton de génération de carte
         self.generate_btn = ttk.Button(
             button_frame,
+            style='JBW.TButton',
             text="Générer la carte",
             command=self.generate_specific_map,
             state='disabled'
@@ -229,6 +511,7 @@ class JBWViewerUI:
         # Bouton d'ouverture de la carte
         self.open_btn = ttk.Button(
             button_frame,
+            style='JBW.TButton',
             text="Ouvrir la carte",
             command=self.open_specific_map,
             state='disabled'
@@ -238,6 +521,7 @@ class JBWViewerUI:
         # Bouton d'exemple
         self.example_btn = ttk.Button(
             button_frame,
+            style='JBW.TButton',
             text="Exemple",
             command=self.load_example_pr
         )
@@ -259,7 +543,7 @@ class JBWViewerUI:
         info_frame.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
         
         # Zone de texte pour les informations
-        self.info_text = tk.Text(info_frame, height=8, width=70, wrap=tk.WORD)
+        self.info_text = tk.Text(info_frame, height=8, width=70, wrap=tk.WORD, undo=False)
         self.info_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # Scrollbar pour la zone de texte
@@ -289,6 +573,7 @@ class JBWViewerUI:
         # Bouton de recherche
         self.search_btn = ttk.Button(
             button_frame,
+            style='JBW.TButton',
             text="Rechercher un PR",
             command=self.search_pr,
             state='disabled'
@@ -298,6 +583,7 @@ class JBWViewerUI:
         # Bouton de quitter
         quit_btn = ttk.Button(
             button_frame,
+            style='JBW.TButton',
             text="Quitter",
             command=self.root.quit
         )
@@ -318,45 +604,138 @@ class JBWViewerUI:
         """
         Ajoute un message à la zone d'informations.
         
+        Les messages sont regroupés et écrits ensemble dès que Tk est
+        disponible : une seule insertion et un seul défilement par lot.
+        
         Args:
             message (str): Message à ajouter
         """
-        self.info_text.insert(tk.END, f"{message}\n")
-        self.info_text.see(tk.END)
+        if not self._info_buf and not self._batching:
+            self.root.after_idle(self._flush_info)
+        self._info_buf.append(f"{message}\n")
+    
+    def _flush_info(self) -> None:
+        """
+        Écrit les messages en attente dans la zone d'informations.
+        """
+        if not self._info_buf:
+            return
+        # Ne faire défiler que si l'utilisateur regardait déjà la fin du texte
+        at_bottom = self.info_text.yview()[1] >= 0.99
+        
+        self.info_text.insert(tk.END, "".join(self._info_buf))
+        self._info_buf = []
+        
+        # Limiter l'historique pour garder un widget de taille bornée
+        line_count = int(self.info_text.index('end-1c').split('.')[0])
+        if line_count > INFO_MAX_LINES:
+            self.info_text.delete('1.0', f'{INFO_TRIM_LINES + 1}.0')
+        
+        if at_bottom:
+            self.info_text.see(tk.END)
     
     def update_status(self, message: str) -> None:
         """
         Met à jour le message de statut.
         
+        L'affichage est différé de quelques millisecondes et laissé à la
+        boucle Tk : si plusieurs statuts se succèdent rapidement, seul le
+        dernier est écrit.
+        
         Args:
             message (str): Nouveau message de statut
         """
-        self.status_var.set(message)
-        self.root.update_idletasks()
+        if self._status_pending is None and not self._batching:
+            self.root.after(STATUS_FLUSH_MS, self._flush_status)
+        self._status_pending = message
     
-    def load_data(self) -> None:
+    def _flush_status(self) -> None:
         """
-        Recharge les données CSV (utilisé pour le rechargement manuel).
+        Affiche le dernier message de statut demandé.
+        """
+        if self._status_pending is None:
+            return
+        self.status_var.set(self._status_pending)
+        self._status_pending = None
+    
+    @contextmanager
+    def _suspend_ui_updates(self):
+        """
+        Regroupe les messages et statuts émis pendant un traitement.
+        
+        À l'intérieur du bloc, add_info et update_status ne programment aucun
+        affichage ; tout est écrit en une fois à la sortie du bloc le plus
+        externe. Les blocs peuvent être imbriqués.
+        
+        Exemple:
+            with self._suspend_ui_updates():
+                self.add_info("...")
+                self.update_status("...")
         """
+        self._batching += 1
         try:
-            self.update_status("Rechargement des données...")
-            self.data_manager = DataManager()
-            
-            if self.data_manager.get_pr_count() > 0:
-                self.data_status.config(text="✅ Données rechargées")
-                self.data_info.config(text=f"{self.data_manager.get_pr_count()} Points de Référence disponibles")
-                self.generate_btn.config(state='normal')
-                self.search_btn.config(state='normal')
-                self.add_info(f"✅ {self.data_manager.get_pr_count()} Points de Référence rechargés avec succès")
-            else:
-                self.data_status.config(text="❌ Erreur de rechargement")
-                self.add_info("❌ Aucune donnée rechargée")
-                
-        except Exception as e:
-            messagebox.showerror("Erreur", f"Erreur lors du rechargement : {e}")
-            self.add_info(f"❌ Erreur : {e}")
+            yield
         finally:
-            self.update_status("Prêt - Données rechargées")
+            self._batching -= 1
+            if not self._batching:
+                try:
+                    self._flush_info()
+                    self._flush_status()
+                except tk.TclError:
+                    pass  # Fenêtre déjà fermée pendant le traitement
+    
+    def _set_generated_map(self, kind: str, filepath: str) -> Tuple[str, str, str]:
+        """
+        Mémorise une carte générée : son nom et son URL ne sont calculés qu'ici.
+        
+        Args:
+            kind (str): Section de l'interface ("pr" ou "specific")
+            filepath (str): Chemin du fichier de carte généré (dans output/)
+            
+        Returns:
+            Tuple[str, str, str]: (chemin, nom du fichier, URL file://)
+        """
+        basename = os.path.basename(filepath)
+        self._maps[kind] = (filepath, basename, f"file://{os.path.abspath(filepath)}")
+        return self._maps[kind]
+    
+    def _run_in_background(self, task: Callable, on_done: Callable[[Future], None], *args, **kwargs) -> None:
+        """
+        Exécute une tâche longue dans le thread de travail.
+        
+        La boucle Tk continue de tourner pendant la tâche. Tkinter n'étant pas
+        thread-safe, le thread de travail ne touche jamais aux widgets : c'est
+        le thread Tk qui surveille la tâche et appelle on_done une fois finie.
+        
+        Args:
+            task (Callable): Fonction à exécuter en arrière-plan
+            on_done (Callable[[Future], None]): Appelée dans le thread Tk avec
+                le Future de la tâche (future.result() donne le résultat ou
+                relève l'exception)
+            *args, **kwargs: Arguments transmis à task
+        """
+        future = self._executor.submit(task, *args, **kwargs)
+        self._poll_background(future, on_done)
+    
+    def _poll_background(self, future: Future, on_done: Callable[[Future], None]) -> None:
+        """
+        Vérifie périodiquement (depuis le thread Tk) si une tâche est terminée.
+        
+        Args:
+            future (Future): Tâche en cours
+            on_done (Callable[[Future], None]): Appelée quand la tâche est terminée
+        """
+        if future.done():
+            on_done(future)
+        else:
+            self.root.after(BACKGROUND_POLL_MS, self._poll_background, future, on_done)
+    
+    def load_data(self) -> None:
+        """
+        Recharge les données CSV (utilisé pour le rechargement manuel).
+        """
+        self.update_status("Rechargement des données...")
+        self._start_data_loading(reload=True)
     
     def generate_map(self) -> None:
         """
@@ -369,48 +748,63 @@ class JBWViewerUI:
             
             self.update_status("Génération de la carte...")
             
-            # Récupérer la limite de marqueurs
-            try:
-                max_markers = int(self.max_markers_var.get())
-            except ValueError:
-                max_markers = 1000
+            # Récupérer la limite de marqueurs (1000 si la saisie n'est pas un entier)
+            max_markers_text = self.max_markers_var.get().strip()
+            max_markers = int(max_markers_text) if max_markers_text.isdecimal() else 1000
             
-            # Créer le générateur de cartes
-            self.map_generator = MapGenerator(self.data_manager)
-            
-            # Générer la carte
-            filepath = self.map_generator.generate_complete_map(
+            # Générer la carte en arrière-plan (l'interface reste réactive)
+            self.generate_btn_bulk.config(state='disabled')
+            self._run_in_background(
+                self.map_generator.generate_complete_map,
+                lambda future: self._on_map_generated(future, max_markers),
                 filename="pr_map.html",
                 max_markers=max_markers
             )
             
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Erreur lors de la génération : {e}")
+            self.add_info(f"❌ Erreur : {e}")
+            self.update_status("Prêt")
+    
+    def _on_map_generated(self, future: Future, max_markers: int) -> None:
+        """
+        Met à jour l'interface une fois la carte des PR générée.
+        
+        Args:
+            future (Future): Tâche de génération terminée
+            max_markers (int): Nombre maximum de marqueurs demandé
+        """
+        try:
+            filepath = future.result()
+            
             if filepath:
-                self.map_status.config(text=f"✅ Carte générée : {os.path.basename(filepath)}")
-                self.open_btn.config(state='normal')
+                _, basename, _ = self._set_generated_map("pr", filepath)
+                self.map_status_bulk.config(text=f"✅ Carte générée : {basename}")
+                self.open_btn_bulk.config(state='normal')
                 self.add_info(f"✅ Carte générée avec succès : {filepath}")
                 self.add_info(f"📍 {min(max_markers, self.data_manager.get_pr_count())} marqueurs affichés")
             else:
-                self.map_status.config(text="❌ Erreur de génération")
+                self.map_status_bulk.config(text="❌ Erreur de génération")
                 self.add_info("❌ Erreur lors de la génération de la carte")
                 
         except Exception as e:
             messagebox.showerror("Erreur", f"Erreur lors de la génération : {e}")
             self.add_info(f"❌ Erreur : {e}")
         finally:
+            self.generate_btn_bulk.config(state='normal')
             self.update_status("Prêt")
     
     def open_map(self) -> None:
         """
         Ouvre la carte dans le navigateur par défaut.
         """
+        import webbrowser  # Importé au premier usage (démarrage plus rapide)
+        
         try:
-            if self.map_generator:
-                filepath = os.path.join("output", "pr_map.html")
-                if os.path.exists(filepath):
-                    webbrowser.open(f"file://{os.path.abspath(filepath)}")
-                    self.add_info("🌐 Carte ouverte dans le navigateur")
-                else:
-                    messagebox.showwarning("Attention", "Aucune carte générée trouvée")
+            if "pr" in self._maps:
+                _, _, url = self._maps["pr"]
+                webbrowser.open(url)
+                self.add_info("🌐 Carte ouverte dans le navigateur")
             else:
                 messagebox.showwarning("Attention", "Veuillez d'abord générer une carte")
         except Exception as e:
@@ -466,8 +860,8 @@ class JBWViewerUI:
                 results_text.insert(tk.END, f"Trouvé {len(results)} résultat(s) :\n\n")
                 for pr in results[:20]:  # Limiter à 20 résultats
                     results_text.insert(tk.END, 
-                        f"• {pr['codeCI']}-{pr['codeCH']} : {pr['libelleCI']}\n"
-                        f"  Coordonnées: X={pr['XLambert93']:.2f}, Y={pr['YLambert93']:.2f}\n\n"
+                        f"• {pr.codeCI}-{pr.codeCH} : {pr.libelleCI}\n"
+                        f"  Coordonnées: X={pr.XLambert93:.0f}, Y={pr.YLambert93:.0f}\n\n"
                     )
                 if len(results) > 20:
                     results_text.insert(tk.END, f"... et {len(results) - 20} autres résultats")
@@ -475,7 +869,7 @@ class JBWViewerUI:
                 results_text.insert(tk.END, "Aucun résultat trouvé")
         
         # Bouton de recherche
-        ttk.Button(search_window, text="Rechercher", command=do_search).pack(pady=10)
+        ttk.Button(search_window, text="Rechercher", command=do_search, style='JBW.TButton').pack(pady=10)
     
     def generate_specific_map(self) -> None:
         """
@@ -492,17 +886,10 @@ class JBWViewerUI:
                 messagebox.showwarning("Attention", "Veuillez saisir au moins un code PR")
                 return
             
-            # Parser les codes PR
-            pr_codes = []
-            for line in pr_text.split('\n'):
-                line = line.strip()
-                if line and '-' in line:
-                    try:
-                        codeCI, codeCH = line.split('-', 1)
-                        pr_codes.append((codeCI.strip(), codeCH.strip()))
-                    except ValueError:
-                        self.add_info(f"⚠️ Format invalide ignoré: {line}")
-                        continue
+            # Parser les codes PR avec description optionnelle
+            pr_codes, pr_descriptions, invalid_lines = _parse_pr_codes(pr_text)
+            for invalid in invalid_lines:
+                self.add_info(f"⚠️ Format invalide ignoré: {invalid}")
             
             if not pr_codes:
                 messagebox.showwarning("Attention", "Aucun code PR valide trouvé")
@@ -510,19 +897,37 @@ class JBWViewerUI:
             
             self.update_status("Génération de la carte avec PR spécifiques...")
             
-            # Créer le générateur de cartes
-            self.map_generator = MapGenerator(self.data_manager)
-            
-            # Générer la carte avec les PR spécifiques
-            filepath = self.map_generator.generate_map_with_specific_pr(
+            # Générer la carte avec les PR spécifiques en arrière-plan
+            self.generate_btn.config(state='disabled')
+            self._run_in_background(
+                self.map_generator.generate_map_with_specific_pr,
+                lambda future: self._on_specific_map_generated(future, len(pr_codes)),
                 pr_codes=pr_codes,
+                pr_descriptions=pr_descriptions,
                 filename="pr_specific_map.html"
             )
             
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Erreur lors de la génération : {e}")
+            self.add_info(f"❌ Erreur : {e}")
+            self.update_status("Prêt")
+    
+    def _on_specific_map_generated(self, future: Future, pr_count: int) -> None:
+        """
+        Met à jour l'interface une fois la carte des PR spécifiques générée.
+        
+        Args:
+            future (Future): Tâche de génération terminée
+            pr_count (int): Nombre de codes PR demandés
+        """
+        try:
+            filepath = future.result()
+            
             if filepath:
-                self.map_status.config(text=f"✅ Carte générée : {os.path.basename(filepath)}")
+                _, basename, _ = self._set_generated_map("specific", filepath)
+                self.map_status.config(text=f"✅ Carte générée : {basename}")
                 self.open_btn.config(state='normal')
-                self.add_info(f"✅ Carte générée avec {len(pr_codes)} PR : {filepath}")
+                self.add_info(f"✅ Carte générée avec {pr_count} PR : {filepath}")
             else:
                 self.map_status.config(text="❌ Erreur de génération")
                 self.add_info("❌ Erreur lors de la génération de la carte")
@@ -531,20 +936,20 @@ class JBWViewerUI:
             messagebox.showerror("Erreur", f"Erreur lors de la génération : {e}")
             self.add_info(f"❌ Erreur : {e}")
         finally:
+            self.generate_btn.config(state='normal')
             self.update_status("Prêt")
     
     def open_specific_map(self) -> None:
         """
         Ouvre la carte dans le navigateur.
         """
+        import webbrowser  # Importé au premier usage (démarrage plus rapide)
+        
         try:
-            if self.map_generator:
-                filepath = os.path.join("output", "pr_specific_map.html")
-                if os.path.exists(filepath):
-                    webbrowser.open(f"file://{os.path.abspath(filepath)}")
-                    self.add_info("🌐 Carte ouverte dans le navigateur")
-                else:
-                    messagebox.showwarning("Attention", "Aucune carte générée trouvée")
+            if "specific" in self._maps:
+                _, _, url = self._maps["specific"]
+                webbrowser.open(url)
+                self.add_info("🌐 Carte ouverte dans le navigateur")
             else:
                 messagebox.showwarning("Attention", "Veuillez d'abord générer une carte")
         except Exception as e:
@@ -560,15 +965,38 @@ class JBWViewerUI:
 583005-FP
 726158-ST"""
         
-        self.pr_codes_text.delete("1.0", tk.END)
-        self.pr_codes_text.insert("1.0", example_codes)
+        self._set_pr_codes_text(example_codes)
         self.add_info("📝 Exemples de codes PR chargés")
     
+    def _set_pr_codes_text(self, content: str) -> None:
+        """
+        Remplace le contenu de la zone de saisie des codes PR.
+        
+        Le texte est inséré en un seul appel Tk, puis l'historique
+        d'annulation du widget est vidé.
+        
+        Args:
+            content (str): Nouveau contenu (codes PR, un par ligne)
+        """
+        self.pr_codes_text.delete("1.0", tk.END)
+        self.pr_codes_text.insert("1.0", content)
+        self.pr_codes_text.edit_reset()
+    
     def load_pr_from_file(self) -> None:
         """
         Charge des codes PR depuis un fichier.
+        
+        La boîte de dialogue bloque la boucle Tk : les messages et l'affichage
+        en attente sont donc écrits avant son ouverture. La lecture du fichier
+        choisi se fait ensuite dans le thread de travail.
         """
+        from tkinter import filedialog  # Importé au premier usage (démarrage plus rapide)
+        
         try:
+            # Afficher ce qui est en attente avant de bloquer sur la boîte de dialogue
+            self._flush_info()
+            self.root.update_idletasks()
+            
             # Ouvrir une boîte de dialogue pour sélectionner un fichier
             file_path = filedialog.askopenfilename(
                 title="Sélectionner un fichier de codes PR",
@@ -580,25 +1008,38 @@ class JBWViewerUI:
             )
             
             if file_path:
-                # Lire le fichier
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    content = file.read().strip()
-                
-                # Charger le contenu dans la zone de texte
-                self.pr_codes_text.delete("1.0", tk.END)
-                self.pr_codes_text.insert("1.0", content)
-                
-                # Compter le nombre de codes
-                lines = [line.strip() for line in content.split('\n') if line.strip()]
-                valid_codes = [line for line in lines if '-' in line]
-                
-                self.add_info(f"📁 Fichier chargé : {os.path.basename(file_path)}")
-                self.add_info(f"📊 {len(valid_codes)} codes PR valides trouvés")
+                # Lire le fichier (et compter les codes au passage) en arrière-plan
+                self._run_in_background(
+                    _read_pr_file,
+                    lambda future: self._on_pr_file_read(future, file_path),
+                    file_path
+                )
                 
         except Exception as e:
             messagebox.showerror("Erreur", f"Erreur lors du chargement du fichier : {e}")
             self.add_info(f"❌ Erreur lors du chargement : {e}")
     
+    def _on_pr_file_read(self, future: Future, file_path: str) -> None:
+        """
+        Affiche les codes PR lus depuis le fichier choisi par l'utilisateur.
+        
+        Args:
+            future (Future): Tâche de lecture terminée
+            file_path (str): Chemin du fichier lu
+        """
+        try:
+            content, valid_count = future.result()
+            
+            # Charger le contenu dans la zone de texte
+            self._set_pr_codes_text(content)
+            
+            self.add_info(f"📁 Fichier chargé : {os.path.basename(file_path)}")
+            self.add_info(f"📊 {valid_count} codes PR valides trouvés")
+            
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Erreur lors du chargement du fichier : {e}")
+            self.add_info(f"❌ Erreur lors du chargement : {e}")
+    
     def load_pr_from_file_path(self, file_path: str) -> None:
         """
         Charge des codes PR depuis un fichier fourni en argument.
@@ -607,20 +1048,14 @@ class JBWViewerUI:
             file_path (str): Chemin vers le fichier de codes PR
         """
         try:
-            # Lire le fichier
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read().strip()
+            # Lire le fichier (et compter les codes au passage)
+            content, valid_count = _read_pr_file(file_path)
             
             # Charger le contenu dans la zone de texte
-            self.pr_codes_text.delete("1.0", tk.END)
-            self.pr_codes_text.insert("1.0", content)
-            
-            # Compter le nombre de codes
-            lines = [line.strip() for line in content.split('\n') if line.strip()]
-            valid_codes = [line for line in lines if '-' in line]
+            self._set_pr_codes_text(content)
             
             self.add_info(f"📁 Fichier chargé au démarrage : {os.path.basename(file_path)}")
-            self.add_info(f"📊 {len(valid_codes)} codes PR valides trouvés")
+            self.add_info(f"📊 {valid_count} codes PR valides trouvés")
             
         except Exception as e:
             self.add_info(f"❌ Erreur lors du chargement du fichier : {e}")
@@ -629,90 +1064,84 @@ class JBWViewerUI:
         """
         Génère automatiquement la carte avec les PR chargés.
         """
-        try:
-            if not self.data_manager:
-                self.add_info("❌ Aucune donnée disponible pour la génération automatique")
-                self.close_application()
-                return
-            
-            # Récupérer les codes PR saisis
-            pr_text = self.pr_codes_text.get("1.0", tk.END).strip()
-            if not pr_text:
-                self.add_info("❌ Aucun code PR saisi pour la génération automatique")
-                self.close_application()
-                return
-            
-            # Parser les codes PR avec description optionnelle
-            pr_codes = []
-            pr_descriptions = {}
-            invalid_lines = []
-            for line_num, line in enumerate(pr_text.split('\n'), 1):
-                line = line.strip()
-                if line and '-' in line:
-                    try:
-                        # Séparer le code PR de la description (optionnelle)
-                        if ';' in line:
-                            pr_part, description = line.split(';', 1)
-                            description = description.strip()
-                        else:
-                            pr_part = line
-                            description = None
-                        
-                        # Parser le code PR
-                        codeCI, codeCH = pr_part.split('-', 1)
-                        codeCI = codeCI.strip()
-                        codeCH = codeCH.strip()
-                        
-                        pr_codes.append((codeCI, codeCH))
-                        if description:
-                            pr_descriptions[f"{codeCI}-{codeCH}"] = description
-                            
-                    except ValueError:
-                        invalid_lines.append(f"Ligne {line_num}: {line}")
-                elif line:  # Ligne non vide mais sans tiret
-                    invalid_lines.append(f"Ligne {line_num}: {line}")
-            
-            if not pr_codes:
-                self.add_info("❌ Aucun code PR valide trouvé dans le fichier")
-                if invalid_lines:
-                    self.add_info("❌ Format invalide détecté :")
-                    for invalid in invalid_lines[:5]:  # Limiter à 5 erreurs
-                        self.add_info(f"   - {invalid}")
-                self.close_application()
-                return
-            
-            # Vérifier que les PR existent dans le référentiel
-            found_prs = []
-            for codeCI, codeCH in pr_codes:
-                prs = self.data_manager.search_pr_by_codes(codeCI=codeCI, codeCH=codeCH)
-                if prs:
-                    found_prs.extend(prs)
-            
-            if not found_prs:
-                self.add_info("❌ Aucun PR trouvé dans le référentiel pour les codes fournis")
-                self.add_info(f"❌ Codes recherchés : {len(pr_codes)} codes")
+        # Au démarrage, les données sont encore en cours de chargement
+        if self._when_data_loaded(self.auto_generate_map):
+            return
+        
+        # Messages et statut affichés en une fois à la fin du traitement
+        with self._suspend_ui_updates():
+            try:
+                if not self.data_manager:
+                    self.add_info("❌ Aucune donnée disponible pour la génération automatique")
+                    self.close_application()
+                    return
+                
+                # Récupérer les codes PR saisis
+                pr_text = self.pr_codes_text.get("1.0", tk.END).strip()
+                if not pr_text:
+                    self.add_info("❌ Aucun code PR saisi pour la génération automatique")
+                    self.close_application()
+                    return
+                
+                # Parser les codes PR avec description optionnelle
+                pr_codes, pr_descriptions, invalid_lines = _parse_pr_codes(pr_text)
+                
+                if not pr_codes:
+                    self.add_info("❌ Aucun code PR valide trouvé dans le fichier")
+                    if invalid_lines:
+                        self.add_info("❌ Format invalide détecté :")
+                        for invalid in invalid_lines[:5]:  # Limiter à 5 erreurs
+                            self.add_info(f"   - {invalid}")
+                    self.close_application()
+                    return
+                
+                # Ignorer les codes en double (en gardant l'ordre du fichier)
+                pr_codes = list(dict.fromkeys(pr_codes))
+                
+                # Vérifier que les PR existent dans le référentiel (accès direct à l'index)
+                pr_index = self.data_manager.pr_index
+                found_count = sum(1 for key in pr_codes if key in pr_index)
+                
+                if not found_count:
+                    self.add_info("❌ Aucun PR trouvé dans le référentiel pour les codes fournis")
+                    self.add_info(f"❌ Codes recherchés : {len(pr_codes)} codes")
+                    self.close_application()
+                    return
+                
+                self.update_status("Génération automatique de la carte...")
+                
+                # Générer la carte avec les PR spécifiques en arrière-plan
+                self._run_in_background(
+                    self.map_generator.generate_map_with_specific_pr,
+                    lambda future: self._on_auto_map_generated(future, found_count),
+                    pr_codes=pr_codes,
+                    pr_descriptions=pr_descriptions,
+                    filename="auto_generated_map.html"
+                )
+                    
+            except Exception as e:
+                self.add_info(f"❌ Erreur lors de la génération automatique : {e}")
                 self.close_application()
-                return
-            
-            self.update_status("Génération automatique de la carte...")
-            
-            # Créer le générateur de cartes
-            self.map_generator = MapGenerator(self.data_manager)
-            
-            # Générer la carte avec les PR spécifiques
-            filepath = self.map_generator.generate_map_with_specific_pr(
-                pr_codes=pr_codes,
-                pr_descriptions=pr_descriptions,
-                filename="auto_generated_map.html"
-            )
+    
+    def _on_auto_map_generated(self, future: Future, found_count: int) -> None:
+        """
+        Termine la génération automatique : ouvre la carte ou ferme l'application.
+        
+        Args:
+            future (Future): Tâche de génération terminée
+            found_count (int): Nombre de PR trouvés dans le référentiel
+        """
+        try:
+            filepath = future.result()
             
             if filepath:
-                self.map_status.config(text=f"✅ Carte générée automatiquement : {os.path.basename(filepath)}")
+                _, basename, _ = self._set_generated_map("specific", filepath)
+                self.map_status.config(text=f"✅ Carte générée automatiquement : {basename}")
                 self.open_btn.config(state='normal')
-                self.add_info(f"✅ Carte générée automatiquement avec {len(found_prs)} PR trouvés : {filepath}")
+                self.add_info(f"✅ Carte générée automatiquement avec {found_count} PR trouvés : {filepath}")
                 
                 # Ouvrir automatiquement la carte
-                self.auto_open_map(filepath)
+                self.auto_open_map()
             else:
                 self.map_status.config(text="❌ Erreur de génération automatique")
                 self.add_info("❌ Erreur lors de la génération automatique de la carte")
@@ -724,15 +1153,18 @@ class JBWViewerUI:
         finally:
             self.update_status("Prêt - Carte générée automatiquement")
     
-    def auto_open_map(self, filepath: str) -> None:
+    def auto_open_map(self) -> None:
         """
         Ouvre automatiquement la carte dans le navigateur et ferme l'application.
         
-        Args:
-            filepath (str): Chemin vers le fichier de carte
+        La carte ouverte est la dernière carte de PR spécifiques mémorisée
+        par _set_generated_map.
         """
+        import webbrowser  # Importé au premier usage (démarrage plus rapide)
+        
         try:
-            webbrowser.open(f"file://{os.path.abspath(filepath)}")
+            _, _, url = self._maps["specific"]
+            webbrowser.open(url)
             self.add_info("🌐 Carte ouverte automatiquement dans le navigateur")
             self.add_info("🔄 Fermeture de l'application...")
             
@@ -746,6 +1178,9 @@ class JBWViewerUI:
         """
         Ferme l'application proprement.
         """
+        # Ne pas attendre les tâches en cours : l'application se ferme
+        self._executor.shutdown(wait=False)
+        
         try:
             self.root.quit()
             self.root.destroy()